@@ -17,7 +17,8 @@ BEFORE FLASHING:
 Author: Alex's BBC micro:bit Project - Fixed Implementation
 """
 
-from microbit import *
+from microbit import display, Image, i2c, sleep
+import struct
 
 # === CORRECT I2C ADDRESSES (from Kitronik TypeScript) ===
 RTC_ADDRESS = 0x6F      # MCP7940-N Real Time Clock (was 0x68 - WRONG!)
@@ -25,6 +26,16 @@ BME688_ADDRESS = 0x77   # BME688 Environmental Sensor
 OLED_ADDRESS = 0x3C     # SSD1306 OLED Display
 EEPROM_ADDRESS = 0x54   # EEPROM Memory
 
+# Column delay for scrolling readings on the LED matrix
+SCROLL_DELAY_MS = 80
+
+# Monitoring loop timing: normal interval, doubled per failed read up to the max
+POLL_INTERVAL_MS = 5000
+MAX_BACKOFF_MS = 60000
+
+# Devices probed at boot, precomputed so the scan loop doesn't rebuild a list
+I2C_DEVICES = (RTC_ADDRESS, BME688_ADDRESS, OLED_ADDRESS, EEPROM_ADDRESS)
+
 # === BME688 REGISTER ADDRESSES (from Kitronik TypeScript) ===
 BME688_CHIP_ID = 0xD0           # Should read 0x61
 BME688_RESET = 0xE0             # Write 0xB6 for soft reset
@@ -32,6 +43,13 @@ BME688_CTRL_MEAS = 0x74         # Control measurement register
 BME688_CTRL_HUM = 0x72          # Control humidity register
 BME688_CONFIG = 0x75            # Configuration register
 BME688_CTRL_GAS_1 = 0x71        # Gas control register
+BME688_MEAS_STATUS_0 = 0x1D     # Bit 7 (new_data_0) set when a measurement is ready
+BME688_NEW_DATA = 0x80
+
+# Forced measurement wait: poll every BME688_POLL_MS, give up after the
+# old fixed 200ms wait and read whatever is there
+BME688_POLL_MS = 5
+BME688_POLL_ATTEMPTS = 40
 
 # Data registers
 BME688_TEMP_MSB = 0x22
@@ -57,20 +75,60 @@ RTC_CONTROL_REG = 0x07
 START_RTC = 0x80
 ENABLE_BATTERY_BACKUP = 0x08
 
+# === PRE-BUILT I2C PAYLOADS ===
+# Constant pointer writes and commands, built once instead of per call
+_PTR_RTC_SECONDS = bytes([RTC_SECONDS_REG])
+_PTR_RTC_WEEKDAY = bytes([RTC_WEEKDAY_REG])
+_PTR_BME688_CHIP_ID = bytes([BME688_CHIP_ID])
+_PTR_BME688_PRESS_MSB = bytes([BME688_PRESS_MSB])
+_PTR_BME688_MEAS_STATUS_0 = bytes([BME688_MEAS_STATUS_0])
+_RTC_CONTROL_CLEAR = bytes([RTC_CONTROL_REG, 0x00])
+_BME688_SOFT_RESET = bytes([BME688_RESET, 0xB6])
+_BME688_FORCED_MODE = bytes([BME688_CTRL_MEAS, 0x55])  # Force mode + oversampling
+
+# Raw-to-unit scale factors as reciprocals: float multiply beats divide
+_TEMP_SCALE = 1.0 / 5120.0
+_PRESS_SCALE = 1.0 / 256.0
+_HUM_SCALE = 1.0 / 512.0
+
+# BME688 configuration script, sent as one transfer: multi-byte writes are
+# (register, value) pairs applied in order, so ctrl_hum still lands before
+# the ctrl_meas write that latches it
+_BME688_INIT_SEQ = bytes([
+    BME688_CTRL_MEAS, 0x00,   # Sleep mode
+    BME688_CTRL_HUM, 0x02,    # Humidity oversampling x2
+    # Temperature bits 7:5 = 010 (x2), Pressure bits 4:2 = 101 (x16)
+    BME688_CTRL_MEAS, 0x54,
+    BME688_CONFIG, 0x0C,      # IIR filter coefficient 3
+    BME688_CTRL_GAS_1, 0x20,  # Enable gas conversion
+])
+
 # === UTILITY FUNCTIONS ===
 
-def bcd_to_int(bcd_value):
-    """Convert BCD to integer"""
-    return (bcd_value >> 4) * 10 + (bcd_value & 0x0F)
+# Lookup tables so the RTC hot paths index a byte instead of doing arithmetic
+_BCD2INT = bytes((b >> 4) * 10 + (b & 0x0F) for b in range(256))
+_INT2BCD = bytes(((i // 10) << 4) | (i % 10) for i in range(100))
 
-def int_to_bcd(int_value):
-    """Convert integer to BCD"""
-    if int_value < 0 or int_value > 99:
-        return 0
-    return ((int_value // 10) << 4) | (int_value % 10)
+def scroll_time_ms(text):
+    """Approximate time display.scroll takes to show text (5 columns per character)"""
+    return (len(text) + 1) * 5 * SCROLL_DELAY_MS
+
+# Weekday of Jan 1st (1=Monday) for each year from _WEEKDAY_FIRST_YEAR, and
+# days before each month in a non-leap year - turns weekday lookup into adds
+_WEEKDAY_FIRST_YEAR = 2024
+_JAN1_WEEKDAY = (1, 3, 4, 5, 6, 1, 2, 3, 4, 6, 7, 1)  # 2024-2035
+_DAYS_BEFORE_MONTH = (0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334)
 
 def calculate_weekday(year, month, day):
     """Calculate weekday (1=Monday, 7=Sunday)"""
+    index = year - _WEEKDAY_FIRST_YEAR
+    if 0 <= index < len(_JAN1_WEEKDAY):
+        days = _DAYS_BEFORE_MONTH[month - 1] + day - 1
+        if month > 2 and year % 4 == 0:  # No century years in the table range
+            days += 1
+        return (_JAN1_WEEKDAY[index] - 1 + days) % 7 + 1
+    
+    # Outside the table: Zeller's congruence
     if month < 3:
         month += 12
         year -= 1
@@ -88,6 +146,13 @@ class FixedRTC:
     def __init__(self):
         self.initialized = False
         self.working = False
+        # Reused burst write buffer: [RTC_SECONDS_REG, sec, min, hr, wkd, day, mon, yr]
+        self._tx = bytearray(8)
+        self._tx[0] = RTC_SECONDS_REG
+        self._tx_seconds = memoryview(self._tx)[:2]  # Just [reg, sec]
+        # Bound I2C methods cached to skip global + attribute lookups per call
+        self._write = i2c.write
+        self._read = i2c.read
     
     def initialize(self):
         """Initialize RTC with correct sequence from Kitronik TypeScript"""
@@ -95,35 +160,35 @@ class FixedRTC:
             display.scroll("RTC INIT", delay=100)
             
             # Step 1: Set external oscillator (from TypeScript)
-            i2c.write(RTC_ADDRESS, bytes([RTC_CONTROL_REG, 0x00]))
+            self._write(RTC_ADDRESS, _RTC_CONTROL_CLEAR)
             
             # Step 2: Enable battery backup
             # Read current weekday register
-            i2c.write(RTC_ADDRESS, bytes([RTC_WEEKDAY_REG]))
-            weekday_data = i2c.read(RTC_ADDRESS, 1)
+            self._write(RTC_ADDRESS, _PTR_RTC_WEEKDAY, repeat=True)
+            weekday_data = self._read(RTC_ADDRESS, 1)
             current_weekday = weekday_data[0]
             
             # Set battery backup bit if not already set
             if (current_weekday & ENABLE_BATTERY_BACKUP) == 0:
                 new_weekday = ENABLE_BATTERY_BACKUP | current_weekday
-                i2c.write(RTC_ADDRESS, bytes([RTC_WEEKDAY_REG, new_weekday]))
+                self._write(RTC_ADDRESS, bytes([RTC_WEEKDAY_REG, new_weekday]))
             
             # Step 3: Start the oscillator
             # Read current seconds register
-            i2c.write(RTC_ADDRESS, bytes([RTC_SECONDS_REG]))
-            seconds_data = i2c.read(RTC_ADDRESS, 1)
+            self._write(RTC_ADDRESS, _PTR_RTC_SECONDS, repeat=True)
+            seconds_data = self._read(RTC_ADDRESS, 1)
             current_seconds = seconds_data[0]
             
             # Start oscillator by setting bit 7
             new_seconds = START_RTC | current_seconds
-            i2c.write(RTC_ADDRESS, bytes([RTC_SECONDS_REG, new_seconds]))
+            self._write(RTC_ADDRESS, bytes([RTC_SECONDS_REG, new_seconds]))
             
             self.initialized = True
             self.working = True
             display.scroll("RTC OK", delay=100)
             return True
             
-        except Exception as e:
+        except Exception:
             display.scroll("RTC FAIL", delay=100)
             self.working = False
             return False
@@ -134,20 +199,22 @@ class FixedRTC:
             return None
             
         try:
-            # Read all 7 registers starting from seconds
-            i2c.write(RTC_ADDRESS, bytes([RTC_SECONDS_REG]))
-            data = i2c.read(RTC_ADDRESS, 7)
-            
-            # Convert BCD to integers (mask off control bits)
-            second = bcd_to_int(data[0] & 0x7F)  # Mask start bit
-            minute = bcd_to_int(data[1] & 0x7F)
-            hour = bcd_to_int(data[2] & 0x3F)    # Mask 12/24 hour bit
-            weekday = bcd_to_int(data[3] & 0x07) # Mask battery backup bit
-            day = bcd_to_int(data[4] & 0x3F)
-            month = bcd_to_int(data[5] & 0x1F)
-            year = 2000 + bcd_to_int(data[6])
-            
-            return (year, month, day, hour, minute, second, weekday)
+            # Read all 7 registers starting from seconds. repeat=True holds
+            # the bus (repeated start) so pointer set + read is one transfer
+            self._write(RTC_ADDRESS, _PTR_RTC_SECONDS, repeat=True)
+            data = self._read(RTC_ADDRESS, 7)
+            
+            # Split all seven registers in one C call, then convert BCD to
+            # integers (mask off control bits)
+            sec, mins, hr, wkd, day, mon, yr = struct.unpack('7B', data)
+            bcd = _BCD2INT
+            return (2000 + bcd[yr],
+                    bcd[mon & 0x1F],
+                    bcd[day & 0x3F],
+                    bcd[hr & 0x3F],    # Mask 12/24 hour bit
+                    bcd[mins & 0x7F],
+                    bcd[sec & 0x7F],   # Mask start bit
+                    bcd[wkd & 0x07])   # Mask battery backup bit
             
         except:
             return None
@@ -160,23 +227,22 @@ class FixedRTC:
         try:
             weekday = calculate_weekday(year, month, day)
             
-            # Prepare data with correct BCD conversion
-            time_data = [
-                int_to_bcd(second),   # Don't add START_RTC bit yet
-                int_to_bcd(minute),
-                int_to_bcd(hour),
-                int_to_bcd(weekday) | ENABLE_BATTERY_BACKUP,  # Keep battery backup
-                int_to_bcd(day),
-                int_to_bcd(month),
-                int_to_bcd(year % 100)
-            ]
+            # Prepare data with correct BCD conversion, in place
+            tx = self._tx
+            tx[1] = _INT2BCD[second]   # Don't add START_RTC bit yet
+            tx[2] = _INT2BCD[minute]
+            tx[3] = _INT2BCD[hour]
+            tx[4] = _INT2BCD[weekday] | ENABLE_BATTERY_BACKUP  # Keep battery backup
+            tx[5] = _INT2BCD[day]
+            tx[6] = _INT2BCD[month]
+            tx[7] = _INT2BCD[year % 100]
             
-            # Write all registers
-            for i, value in enumerate(time_data):
-                i2c.write(RTC_ADDRESS, bytes([RTC_SECONDS_REG + i, value]))
+            # Write all seven registers in one auto-incrementing burst
+            self._write(RTC_ADDRESS, tx)
             
             # Finally, start the oscillator
-            i2c.write(RTC_ADDRESS, bytes([RTC_SECONDS_REG, time_data[0] | START_RTC]))
+            tx[1] |= START_RTC
+            self._write(RTC_ADDRESS, self._tx_seconds)
             
             return True
             
@@ -190,6 +256,8 @@ class FixedBME688:
     def __init__(self):
         self.working = False
         self.initialized = False
+        self._write = i2c.write
+        self._read = i2c.read
     
     def initialize(self):
         """Initialize BME688 with correct sequence from Kitronik TypeScript"""
@@ -197,86 +265,87 @@ class FixedBME688:
             display.scroll("BME INIT", delay=100)
             
             # Step 1: Check chip ID
-            i2c.write(BME688_ADDRESS, bytes([BME688_CHIP_ID]))
-            chip_id = i2c.read(BME688_ADDRESS, 1)[0]
+            self._write(BME688_ADDRESS, _PTR_BME688_CHIP_ID)
+            chip_id = self._read(BME688_ADDRESS, 1)[0]
             
             if chip_id != 0x61:
                 display.scroll("BME WRONG ID", delay=100)
                 return False
             
             # Step 2: Soft reset
-            i2c.write(BME688_ADDRESS, bytes([BME688_RESET, 0xB6]))
-            sleep(1000)  # Wait 1 second as per TypeScript
-            
-            # Step 3: Set sleep mode
-            i2c.write(BME688_ADDRESS, bytes([BME688_CTRL_MEAS, 0x00]))
-            
-            # Step 4: Set humidity oversampling (x2)
-            i2c.write(BME688_ADDRESS, bytes([BME688_CTRL_HUM, 0x02]))
+            self._write(BME688_ADDRESS, _BME688_SOFT_RESET)
+            sleep(10)  # Reset settle time used by the Bosch BME68x driver
             
-            # Step 5: Set temperature (x2) and pressure (x16) oversampling
-            # Temperature bits 7:5 = 010 (x2), Pressure bits 4:2 = 101 (x16)
-            i2c.write(BME688_ADDRESS, bytes([BME688_CTRL_MEAS, 0x54]))
-            
-            # Step 6: Set IIR filter coefficient to 3
-            i2c.write(BME688_ADDRESS, bytes([BME688_CONFIG, 0x0C]))
-            
-            # Step 7: Enable gas conversion
-            i2c.write(BME688_ADDRESS, bytes([BME688_CTRL_GAS_1, 0x20]))
+            # Steps 3-7: sleep mode, oversampling, IIR filter, gas enable
+            self._write(BME688_ADDRESS, _BME688_INIT_SEQ)
             
             self.working = True
             self.initialized = True
             display.scroll("BME OK", delay=100)
             return True
             
-        except Exception as e:
+        except Exception:
             display.scroll("BME FAIL", delay=100)
             self.working = False
             return False
     
     def read_data(self):
-        """Read environmental data from BME688"""
+        """Read environmental data from BME688 as (temp, pressure, humidity, air_quality)"""
         if not self.working:
             return None
             
         try:
-            # Trigger forced measurement
-            i2c.write(BME688_ADDRESS, bytes([BME688_CTRL_MEAS, 0x55]))  # Force mode + oversampling
-            sleep(200)  # Wait for measurement
-            
-            # Read temperature data
-            i2c.write(BME688_ADDRESS, bytes([BME688_TEMP_MSB]))
-            temp_data = i2c.read(BME688_ADDRESS, 3)
-            temp_raw = (temp_data[0] << 12) | (temp_data[1] << 4) | (temp_data[2] >> 4)
+            # Bind the bus methods and address once for the polling loop
+            write = self._write
+            read = self._read
+            addr = BME688_ADDRESS
             
-            # Read pressure data
-            i2c.write(BME688_ADDRESS, bytes([BME688_PRESS_MSB]))
-            press_data = i2c.read(BME688_ADDRESS, 3)
-            press_raw = (press_data[0] << 12) | (press_data[1] << 4) | (press_data[2] >> 4)
-            
-            # Read humidity data
-            i2c.write(BME688_ADDRESS, bytes([BME688_HUM_MSB]))
-            hum_data = i2c.read(BME688_ADDRESS, 2)
-            hum_raw = (hum_data[0] << 8) | hum_data[1]
+            # Trigger forced measurement
+            write(addr, _BME688_FORCED_MODE)
+            
+            # Wait for measurement: T/P/H conversion typically takes tens
+            # of ms, so poll new_data_0 rather than always sleeping 200ms
+            for _ in range(BME688_POLL_ATTEMPTS):
+                sleep(BME688_POLL_MS)
+                write(addr, _PTR_BME688_MEAS_STATUS_0, repeat=True)
+                if read(addr, 1)[0] & BME688_NEW_DATA:
+                    break
+            
+            # Burst-read pressure, temperature and humidity (0x1F..0x26) in
+            # one transaction - the register pointer auto-increments on read
+            write(addr, _PTR_BME688_PRESS_MSB, repeat=True)
+            raw = read(addr, 8)
+            
+            # Unpack in C: 20-bit values are a big-endian MSB/LSB pair plus
+            # the top nibble of XLSB, humidity is a plain 16-bit value
+            press_hi, press_xlsb, temp_hi, temp_xlsb, hum_raw = struct.unpack('>HBHBH', raw)
+            press_raw = (press_hi << 4) | (press_xlsb >> 4)
+            temp_raw = (temp_hi << 4) | (temp_xlsb >> 4)
             
             # Simple conversion (without calibration coefficients for now)
             # These are approximate values - real BME688 needs calibration
-            temperature = (temp_raw / 5120.0) - 40  # Rough approximation
-            pressure = press_raw / 256.0            # Rough approximation
-            humidity = (hum_raw / 512.0)            # Rough approximation
-            
-            # Constrain values to reasonable ranges
-            temperature = max(-40, min(85, temperature))
-            pressure = max(300, min(1100, pressure))
-            humidity = max(0, min(100, humidity))
-            
-            return {
-                'temperature': temperature,
-                'pressure': pressure,
-                'humidity': humidity,
-                'gas_resistance': 50000,  # Placeholder - needs proper calculation
-                'air_quality': 'Good'     # Placeholder
-            }
+            temperature = temp_raw * _TEMP_SCALE - 40  # Rough approximation
+            pressure = press_raw * _PRESS_SCALE        # Rough approximation
+            humidity = hum_raw * _HUM_SCALE            # Rough approximation
+            
+            # Constrain values to reasonable ranges. The uncalibrated
+            # conversion can overshoot, so keep the clamp but use plain
+            # comparisons rather than six min()/max() calls per reading
+            if temperature < -40:
+                temperature = -40
+            elif temperature > 85:
+                temperature = 85
+            if pressure < 300:
+                pressure = 300
+            elif pressure > 1100:
+                pressure = 1100
+            if humidity < 0:
+                humidity = 0
+            elif humidity > 100:
+                humidity = 100
+            
+            # Fixed-schema tuple: (temperature, pressure, humidity, air_quality)
+            return (temperature, pressure, humidity, 'Good')  # Air quality placeholder
             
         except:
             return None
@@ -289,28 +358,33 @@ class AirQualityMonitor:
         self.rtc = FixedRTC()
         self.bme688 = FixedBME688()
         self.system_ok = False
+        self._messages = ()  # Pages of the current reading cycle
+        self._page = 0
+        self.last_read_ok = True
     
     def initialize_hardware(self):
         """Initialize all hardware components"""
         display.show(Image.HEART)
         sleep(1000)
         
-        # Test I2C devices
-        display.scroll("SCANNING I2C", delay=80)
-        devices_found = []
-        
-        for addr in [RTC_ADDRESS, BME688_ADDRESS, OLED_ADDRESS, EEPROM_ADDRESS]:
+        # Test I2C devices, collecting one bit per I2C_DEVICES entry
+        # (bit 0 = RTC, 1 = BME688, 2 = OLED, 3 = EEPROM; F = all found)
+        devices_mask = 0
+        for i, addr in enumerate(I2C_DEVICES):
             try:
-                i2c.write(addr, bytes([0x00]))
-                devices_found.append(addr)
-                display.scroll("FOUND 0x{:02X}".format(addr), delay=80)
+                # Address-only probe (START+ADDR+STOP): sending a data byte
+                # would write register 0 of whatever answers, e.g. the EEPROM
+                i2c.write(addr, b'')
+                devices_mask |= 1 << i
             except:
-                display.scroll("MISS 0x{:02X}".format(addr), delay=80)
+                pass
         
-        if len(devices_found) == 0:
+        if devices_mask == 0:
             display.scroll("NO I2C DEVICES", delay=80)
             return False
         
+        display.scroll("I2C:%X" % devices_mask, delay=60)
+        
         # Initialize RTC
         rtc_ok = self.rtc.initialize()
         
@@ -366,35 +440,71 @@ class AirQualityMonitor:
         sleep(2000)
         return success
     
-    def display_readings(self):
-        """Display sensor readings and time"""
-        # Get current time
-        current_time = self.rtc.read_time()
-        
-        # Get sensor data
-        sensor_data = self.bme688.read_data()
+    def _build_messages(self):
+        """Take one snapshot of time and sensor data as display pages"""
+        messages = []
         
+        current_time = self.rtc.read_time()
         if current_time:
-            time_str = "{:02d}:{:02d}:{:02d}".format(current_time[3], current_time[4], current_time[5])
-            display.scroll("TIME: {}".format(time_str), delay=80)
+            messages.append("TIME: %02d:%02d:%02d" % (current_time[3], current_time[4], current_time[5]))
         
+        sensor_data = self.bme688.read_data()
+        self.last_read_ok = sensor_data is not None
         if sensor_data:
-            display.scroll("TEMP: {:.1f}C".format(sensor_data['temperature']), delay=80)
-            display.scroll("HUMID: {:.1f}%".format(sensor_data['humidity']), delay=80)
-            display.scroll("PRESS: {:.1f}hPa".format(sensor_data['pressure']), delay=80)
-            display.scroll("AIR: {}".format(sensor_data['air_quality']), delay=80)
+            temperature, pressure, humidity, air_quality = sensor_data
+            add = messages.append
+            add("TEMP: %.1fC" % temperature)
+            add("HUMID: %.1f%%" % humidity)
+            add("PRESS: %.1fhPa" % pressure)
+            add("AIR: %s" % air_quality)
         else:
-            display.scroll("NO SENSOR DATA", delay=80)
+            messages.append("NO SENSOR DATA")
+        
+        return messages
+    
+    def display_readings(self):
+        """Scroll the next page of readings in the background, returning (text, fresh_read)"""
+        # Start a new cycle (and take fresh readings) once every page is shown
+        fresh = self._page >= len(self._messages)
+        if fresh:
+            self._messages = self._build_messages()
+            self._page = 0
+        
+        message = self._messages[self._page]
+        self._page += 1
+        display.scroll(message, delay=SCROLL_DELAY_MS, wait=False)
+        return message, fresh
     
     def run(self):
         """Main monitoring loop"""
+        # Local names for everything the loop touches each tick
+        display_readings = self.display_readings
+        pause = sleep
+        scroll_time = scroll_time_ms
+        poll_interval = POLL_INTERVAL_MS
+        max_backoff = MAX_BACKOFF_MS
+        
+        backoff = poll_interval
         while True:
             if self.system_ok:
-                self.display_readings()
-                sleep(5000)  # 5 second intervals
+                # Back off while reads keep failing so we don't hammer I2C;
+                # only a fresh read changes the backoff, not later pages
+                try:
+                    message, fresh = display_readings()
+                    if fresh:
+                        if self.last_read_ok:
+                            backoff = poll_interval
+                        else:
+                            backoff = min(backoff * 2, max_backoff)
+                except Exception:
+                    message = ""
+                    backoff = min(backoff * 2, max_backoff)
+                
+                # Stretch the wait so a long page can finish scrolling
+                pause(max(backoff, scroll_time(message)))
             else:
                 display.scroll("SYSTEM ERROR", delay=80)
-                sleep(2000)
+                pause(2000)
 
 
 # === MAIN PROGRAM ===
@@ -424,7 +534,7 @@ def main():
     
     try:
         monitor.run()
-    except Exception as e:
+    except Exception:
         display.scroll("ERROR IN MAIN", delay=80)
         while True:
             display.show(Image.SAD)
@@ -15,10 +15,40 @@ Author: Alex's BBC micro:bit Project
 """
 
 import datetime
-import re
 import os
 import sys
 
+# Markers around the block of current_* assignments in main.py
+INJECTION_START = "# === AUTO TIME INJECTION POINT ==="
+INJECTION_END = "# === END INJECTION POINT ==="
+TIME_FIELDS = ("year", "month", "day", "hour", "minute", "second")
+
+def inject_line(line, values):
+    """
+    Rewrite a `current_<field> = <number>` line with its new value
+    
+    Args:
+        line (str): Source line, including any indentation and newline
+        values (dict): Maps variable names (e.g. 'current_year') to values
+    
+    Returns:
+        str: The updated line, or None if it isn't a time assignment
+    """
+    stripped = line.lstrip()
+    name, sep, rest = stripped.partition("=")
+    name = name.strip()
+    if not sep or name not in values:
+        return None
+    
+    number = rest.lstrip()
+    digits = len(number) - len(number.lstrip("0123456789"))
+    if digits == 0:
+        return None
+    
+    indent = line[:len(line) - len(stripped)]
+    # Keep whatever follows the number (trailing comment, newline)
+    return f"{indent}{name} = {values[name]}{number[digits:]}"
+
 def inject_current_time(file_path):
     """
     Inject current system time into micro:bit Python code
@@ -39,50 +69,58 @@ def inject_current_time(file_path):
     
     print(f"🕐 Injecting current time: {now.strftime('%Y-%m-%d %H:%M:%S')}")
     
-    # Read the file
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Find the injection point
-    injection_pattern = r'(# === AUTO TIME INJECTION POINT ===.*?)(current_year\s*=\s*\d+)(.*?)(current_month\s*=\s*\d+)(.*?)(current_day\s*=\s*\d+)(.*?)(current_hour\s*=\s*\d+)(.*?)(current_minute\s*=\s*\d+)(.*?)(current_second\s*=\s*\d+)(.*?)(# === END INJECTION POINT ===)'
-    
-    # Replacement with current time
-    def replace_time_values(match):
-        return (
-            match.group(1) +  # Comment
-            f"current_year = {now.year}" +
-            match.group(3) +  # Whitespace/comment
-            f"current_month = {now.month}" +
-            match.group(5) +  # Whitespace/comment
-            f"current_day = {now.day}" +
-            match.group(7) +  # Whitespace/comment
-            f"current_hour = {now.hour}" +
-            match.group(9) +  # Whitespace/comment
-            f"current_minute = {now.minute}" +
-            match.group(11) + # Whitespace/comment
-            f"current_second = {now.second}" +
-            match.group(13) + # Whitespace/comment
-            match.group(14)   # End comment
-        )
-    
-    # Apply the replacement
-    updated_content = re.sub(injection_pattern, replace_time_values, content, flags=re.DOTALL)
+    # Stream the file through a temp copy, rewriting the assignments
+    # between the markers as they go past
+    values = {f"current_{field}": getattr(now, field) for field in TIME_FIELDS}
+    temp_path = file_path + ".tmp"
+    injected = set()
+    inside = False
+    
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f_in, \
+             open(temp_path, 'w', encoding='utf-8') as f_out:
+            for line in f_in:
+                stripped = line.strip()
+                if stripped.startswith(INJECTION_START):
+                    inside = True
+                elif stripped.startswith(INJECTION_END):
+                    inside = False
+                elif inside:
+                    new_line = inject_line(line, values)
+                    if new_line is not None:
+                        line = new_line
+                        injected.add(line.split("=", 1)[0].strip())
+                f_out.write(line)
+    except OSError as e:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        print(f"❌ Error: Could not write '{temp_path}': {e}")
+        return False
     
     # Check if replacement was successful
-    if updated_content == content:
+    if injected != set(values):
+        os.remove(temp_path)
         print("⚠️  Warning: No time injection point found in file")
         print("   Make sure your main.py has the AUTO TIME INJECTION POINT markers")
         return False
     
-    # Create backup
+    # Create backup by renaming the original (no second copy written)
     backup_path = file_path + ".backup"
-    with open(backup_path, 'w', encoding='utf-8') as f:
-        f.write(content)
+    try:
+        os.replace(file_path, backup_path)
+    except OSError as e:
+        os.remove(temp_path)
+        print(f"❌ Error: Could not create backup '{backup_path}': {e}")
+        return False
     print(f"💾 Backup created: {backup_path}")
     
-    # Write updated file
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(updated_content)
+    # Move the updated file into place, putting the original back if that fails
+    try:
+        os.replace(temp_path, file_path)
+    except OSError as e:
+        os.replace(backup_path, file_path)
+        print(f"❌ Error: Could not write '{file_path}': {e}")
+        return False
     
     print(f"✅ Time injected successfully into {file_path}")
     print(f"🚀 Ready to flash to micro:bit!")
@@ -14,13 +14,89 @@ Key Principles:
 
 import unittest
 from unittest.mock import Mock, patch
-from datetime import datetime, date
+from datetime import datetime, date, MINYEAR, MAXYEAR
+from functools import lru_cache
+from bisect import bisect_left
+from operator import attrgetter
 import sys
 import os
+import time
 
 # Add src directory to Python path for testing
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
+# Weekday (1=Monday..7=Sunday) for every day of 2024-2123, built on first use
+_WEEKDAY_FIRST_YEAR = 2024
+_WEEKDAY_LAST_YEAR = 2123
+_WEEKDAY_EPOCH = date(_WEEKDAY_FIRST_YEAR, 1, 1).toordinal()
+_WEEKDAY_TABLE = None
+
+def _weekday_table():
+    """Return the packed weekday table, building it on the first call"""
+    global _WEEKDAY_TABLE
+    if _WEEKDAY_TABLE is None:
+        days = date(_WEEKDAY_LAST_YEAR + 1, 1, 1).toordinal() - _WEEKDAY_EPOCH
+        first = date.fromordinal(_WEEKDAY_EPOCH).isoweekday() - 1
+        _WEEKDAY_TABLE = bytes((first + i) % 7 + 1 for i in range(days))
+    return _WEEKDAY_TABLE
+
+def _zeller_weekday(year, month, day):
+    """Zeller's congruence, for dates outside the weekday table"""
+    if month < 3:
+        month += 12
+        year -= 1
+    
+    # Zeller's congruence returns 0=Saturday, 1=Sunday, 2=Monday...
+    zeller_result = (day + (13 * (month + 1)) // 5 + year + 
+                    year // 4 - year // 100 + year // 400) % 7
+    
+    # Convert to ISO format: 1=Monday, 2=Tuesday..., 7=Sunday
+    return ((zeller_result + 5) % 7) + 1
+
+@lru_cache(maxsize=512, typed=True)
+def _calc_weekday(year, month, day):
+    """Memoized weekday lookup behind RTCLogic.calculate_weekday"""
+    if _WEEKDAY_FIRST_YEAR <= year <= _WEEKDAY_LAST_YEAR:
+        try:
+            return _weekday_table()[date(year, month, day).toordinal() - _WEEKDAY_EPOCH]
+        except (ValueError, TypeError):
+            pass  # Not a real date, or not ints - answer with Zeller as before
+    return _zeller_weekday(year, month, day)
+
+# Days in each month of a non-leap year, indexed by month number
+_MONTH_DAYS = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+@lru_cache(maxsize=256, typed=True)
+def _is_valid_time(year, month, day, hour, minute, second):
+    """Memoized range check behind RTCLogic.is_valid_time"""
+    # Only whole numbers are valid components (typed=True keeps 1 and 1.0
+    # in separate cache entries)
+    for value in (year, month, day, hour, minute, second):
+        if not isinstance(value, int):
+            return False
+    
+    # Same limits datetime() enforces, without building one
+    if not (MINYEAR <= year <= MAXYEAR and 1 <= month <= 12 and
+            0 <= hour <= 23 and 0 <= minute <= 59 and 0 <= second <= 59):
+        return False
+    if 1 <= day <= _MONTH_DAYS[month]:
+        return True
+    # Only 29 February can still be valid, and only in a leap year
+    return (month == 2 and day == 29 and
+            year % 4 == 0 and (year % 100 != 0 or year % 400 == 0))
+
+# Current year and the monotonic time it was read; refreshed at most hourly
+_YEAR_CACHE = [0, None]
+_YEAR_TTL_S = 3600
+
+def _year_now():
+    """Return the current year, re-reading the wall clock at most once an hour"""
+    now = time.monotonic()
+    if _YEAR_CACHE[1] is None or now - _YEAR_CACHE[1] > _YEAR_TTL_S:
+        _YEAR_CACHE[0] = datetime.now().year
+        _YEAR_CACHE[1] = now
+    return _YEAR_CACHE[0]
+
 class RTCLogic:
     """Pure logic for RTC operations - no hardware dependencies"""
     
@@ -36,29 +112,32 @@ class RTCLogic:
             raise ValueError("Value must be between 0 and 99")
         return ((int_value // 10) << 4) | (int_value % 10)
     
+    @staticmethod
+    def bcd_frame_to_ints(frame):
+        """Convert a whole frame of BCD bytes (e.g. a 7-byte RTC read) at once"""
+        # Treat the frame as one big integer and convert every byte lane
+        # together: each lane stays below 256 (15 * 10 + 15), so no carries
+        size = len(frame)
+        low_nibbles = int.from_bytes(b'\x0f' * size, 'little')
+        packed = int.from_bytes(frame, 'little')
+        tens = (packed >> 4) & low_nibbles
+        units = packed & low_nibbles
+        return tuple((tens * 10 + units).to_bytes(size, 'little'))
+    
+    @staticmethod
+    def ints_to_bcd_frame(values):
+        """Convert a sequence of integers to a frame of BCD bytes"""
+        return bytes(RTCLogic.int_to_bcd(value) for value in values)
+    
     @staticmethod
     def calculate_weekday(year, month, day):
         """Calculate day of week (1=Monday, 7=Sunday)"""
-        # Zeller's congruence algorithm
-        if month < 3:
-            month += 12
-            year -= 1
-        
-        # Zeller's congruence returns 0=Saturday, 1=Sunday, 2=Monday...
-        zeller_result = (day + (13 * (month + 1)) // 5 + year + 
-                        year // 4 - year // 100 + year // 400) % 7
-        
-        # Convert to ISO format: 1=Monday, 2=Tuesday..., 7=Sunday
-        return ((zeller_result + 5) % 7) + 1
+        return _calc_weekday(year, month, day)
     
     @staticmethod
     def is_valid_time(year, month, day, hour, minute, second):
         """Validate time components"""
-        try:
-            datetime(year, month, day, hour, minute, second)
-            return True
-        except ValueError:
-            return False
+        return _is_valid_time(year, month, day, hour, minute, second)
     
     @staticmethod
     def time_needs_setting(rtc_time, current_year=None):
@@ -67,11 +146,16 @@ class RTCLogic:
             return True
         
         year = rtc_time[0] if isinstance(rtc_time, tuple) else rtc_time.get('year')
-        current_year = current_year or datetime.now().year
+        current_year = current_year or _year_now()
         
         # If RTC year is before 2024 or more than 1 year in future, needs setting
         return year < 2024 or year > current_year + 1
 
+# Inclusive upper bound of each IAQ band, and the label for every band
+_IAQ_BOUNDS = (50, 100, 150, 200, 300)
+_IAQ_LABELS = ("Excellent", "Good", "Lightly Polluted", "Moderately Polluted",
+               "Heavily Polluted", "Severely Polluted")
+
 class SensorDataProcessor:
     """Pure logic for processing sensor data"""
     
@@ -93,6 +177,16 @@ class SensorDataProcessor:
         humidity = raw_humidity / 1000.0
         return max(0, min(100, humidity))  # Clamp to 0-100%
     
+    @staticmethod
+    def convert_frame(raw_temp, raw_humidity, raw_pressure, calibration_offset=0):
+        """Convert a full raw reading to (Celsius, percentage, Pascals) in one call"""
+        humidity = raw_humidity / 1000.0
+        return (
+            round(raw_temp / 1000.0 + calibration_offset, 1),
+            0 if humidity < 0 else 100 if humidity > 100 else humidity,
+            raw_pressure / 100.0,
+        )
+    
     @staticmethod
     def calculate_heat_index(temp_celsius, humidity_percent):
         """Calculate heat index (feels-like temperature)"""
@@ -112,18 +206,27 @@ class SensorDataProcessor:
     @staticmethod
     def air_quality_description(iaq_score):
         """Convert IAQ score to human-readable description"""
-        if iaq_score <= 50:
-            return "Excellent"
-        elif iaq_score <= 100:
-            return "Good"
-        elif iaq_score <= 150:
-            return "Lightly Polluted"
-        elif iaq_score <= 200:
-            return "Moderately Polluted"
-        elif iaq_score <= 300:
-            return "Heavily Polluted"
-        else:
-            return "Severely Polluted"
+        return _IAQ_LABELS[bisect_left(_IAQ_BOUNDS, iaq_score)]
+
+class Reading:
+    """One logged sensor reading - fixed fields, no per-reading dict"""
+    
+    __slots__ = ('timestamp', 'temperature', 'humidity', 'pressure', 'air_quality')
+    
+    def __init__(self, timestamp, temperature, humidity, pressure, air_quality):
+        self.timestamp = timestamp
+        self.temperature = temperature
+        self.humidity = humidity
+        self.pressure = pressure
+        self.air_quality = air_quality
+    
+    def __repr__(self):
+        return "Reading(%r, %r, %r, %r, %r)" % (
+            self.timestamp, self.temperature, self.humidity,
+            self.pressure, self.air_quality
+        )
+
+_get_air_quality = attrgetter('air_quality')
 
 class DataLogger:
     """Pure logic for data logging and analysis"""
@@ -133,13 +236,7 @@ class DataLogger:
     
     def add_reading(self, timestamp, temperature, humidity, pressure, air_quality):
         """Add a sensor reading"""
-        reading = {
-            'timestamp': timestamp,
-            'temperature': temperature,
-            'humidity': humidity,
-            'pressure': pressure,
-            'air_quality': air_quality
-        }
+        reading = Reading(timestamp, temperature, humidity, pressure, air_quality)
         self.data.append(reading)
         return reading
     
@@ -154,20 +251,22 @@ class DataLogger:
         
         # For testing, just use last N readings as proxy for time period
         recent = self.get_recent_readings(hours)
-        temps = [r['temperature'] for r in recent]
-        return round(sum(temps) / len(temps), 1) if temps else None
+        if not recent:
+            return None
+        return round(sum(r.temperature for r in recent) / len(recent), 1)
     
     def detect_air_quality_trend(self):
         """Detect if air quality is improving, worsening, or stable"""
-        if len(self.data) < 3:
+        data = self.data
+        if len(data) < 3:
             return "insufficient_data"
         
-        recent_readings = self.data[-3:]
-        air_qualities = [r['air_quality'] for r in recent_readings]
+        # Only the oldest and newest of the last three readings matter
+        change = _get_air_quality(data[-1]) - _get_air_quality(data[-3])
         
-        if air_qualities[-1] > air_qualities[0] + 10:
+        if change > 10:
             return "worsening"
-        elif air_qualities[-1] < air_qualities[0] - 10:
+        elif change < -10:
             return "improving"
         else:
             return "stable"
@@ -175,32 +274,41 @@ class DataLogger:
 class DisplayFormatter:
     """Pure logic for formatting display output"""
     
+    # Prebuilt %-templates, shared by every call
+    _TIME_FMT = "%02d:%02d"
+    _DATE_FMT = "%02d/%02d"
+    _DATE_YEAR_FMT = "%02d/%02d/%s"
+    _TEMP_C_FMT = "%.1f°C"
+    _TEMP_F_FMT = "%.1f°F"
+    _KPA_FMT = "%.1fkPa"
+    _PA_FMT = "%.0fPa"
+    
     @staticmethod
     def format_time_display(hour, minute):
         """Format time for display"""
-        return f"{hour:02d}:{minute:02d}"
+        return DisplayFormatter._TIME_FMT % (hour, minute)
     
     @staticmethod
     def format_date_display(day, month, year=None):
         """Format date for display"""
         if year:
-            return f"{day:02d}/{month:02d}/{year}"
-        return f"{day:02d}/{month:02d}"
+            return DisplayFormatter._DATE_YEAR_FMT % (day, month, year)
+        return DisplayFormatter._DATE_FMT % (day, month)
     
     @staticmethod
     def format_temperature(temp_celsius, unit='C'):
         """Format temperature for display"""
         if unit.upper() == 'F':
             temp_f = (temp_celsius * 9/5) + 32
-            return f"{temp_f:.1f}°F"
-        return f"{temp_celsius:.1f}°C"
+            return DisplayFormatter._TEMP_F_FMT % temp_f
+        return DisplayFormatter._TEMP_C_FMT % temp_celsius
     
     @staticmethod
     def format_pressure(pressure_pa):
         """Format pressure for display"""
         if pressure_pa > 1000:
-            return f"{pressure_pa/1000:.1f}kPa"
-        return f"{pressure_pa:.0f}Pa"
+            return DisplayFormatter._KPA_FMT % (pressure_pa / 1000)
+        return DisplayFormatter._PA_FMT % pressure_pa
     
     @staticmethod
     def truncate_for_display(text, max_length=16):
@@ -234,6 +342,10 @@ class MockHardware(HardwareInterface):
     """Mock hardware for testing"""
     
     def __init__(self):
+        self.reset()
+    
+    def reset(self):
+        """Restore the power-on state so one instance can be reused across tests"""
         self.rtc_time = None
         self.sensor_data = {
             'temperature': 25.0,
@@ -302,9 +414,9 @@ class AirQualityMonitor:
             rtc_time = self.hardware.read_rtc()
             
             # Process the raw data
-            temperature = self.sensor_processor.convert_temperature(raw_data['temperature'])
-            humidity = self.sensor_processor.convert_humidity(raw_data['humidity'])
-            pressure = self.sensor_processor.convert_pressure(raw_data['pressure'])
+            temperature, humidity, pressure = self.sensor_processor.convert_frame(
+                raw_data['temperature'], raw_data['humidity'], raw_data['pressure']
+            )
             air_quality = raw_data['air_quality']
             
             # Log the reading
@@ -328,13 +440,13 @@ class AirQualityMonitor:
         reading = recent_reading[0]
         
         # Format display lines
-        temp_text = self.display_formatter.format_temperature(reading['temperature'])
-        humidity_text = f"H: {reading['humidity']:.1f}%"
-        pressure_text = self.display_formatter.format_pressure(reading['pressure'])
-        air_quality_text = f"AQ: {self.sensor_processor.air_quality_description(reading['air_quality'])}"
+        temp_text = self.display_formatter.format_temperature(reading.temperature)
+        humidity_text = "H: %.1f%%" % reading.humidity
+        pressure_text = self.display_formatter.format_pressure(reading.pressure)
+        air_quality_text = "AQ: %s" % self.sensor_processor.air_quality_description(reading.air_quality)
         
         # Write to display
-        self.hardware.write_display(f"T: {temp_text}", 0)
+        self.hardware.write_display("T: %s" % temp_text, 0)
         self.hardware.write_display(humidity_text, 1)
         self.hardware.write_display(pressure_text, 2)
         self.hardware.write_display(air_quality_text, 3)